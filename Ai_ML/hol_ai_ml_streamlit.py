@@ -2,11 +2,24 @@ import streamlit as st
 import json
 import _snowflake
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 from snowflake.snowpark.context import get_active_session
 from snowflake.snowpark.exceptions import SnowparkSQLException
-import time
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library if orjson is not installed
+    orjson = None
 
 # Semantic model path
 AVAILABLE_SEMANTIC_MODELS_PATHS = ("@DEV_ARENAFLOW.AI_ML.SEMANTIC_MODELS/tweet_metrics.yaml",)
@@ -14,18 +27,65 @@ AVAILABLE_SEMANTIC_MODELS_PATHS = ("@DEV_ARENAFLOW.AI_ML.SEMANTIC_MODELS/tweet_m
 API_ENDPOINT = "/api/v2/cortex/analyst/message"
 FEEDBACK_API_ENDPOINT = "/api/v2/cortex/analyst/feedback"
 API_TIMEOUT = 50000  # in milliseconds
+CHART_CACHE_SIZE = 16  # number of chart series kept per session
+SUMMARY_PREVIEW_ROWS = 5  # rows sent to Cortex Complete, to avoid token limits
+SUMMARY_TIMEOUT = 60  # in seconds
+
+# Question asked on behalf of the user to open a new conversation
+BOOTSTRAP_QUESTION = "What questions can I ask?"
+BOOTSTRAP_MESSAGE = {"role": "user", "content": [{"type": "text", "text": BOOTSTRAP_QUESTION}]}
 
 # Initialize a Snowpark session for executing queries
 session = get_active_session()
 
+def get_executor() -> ThreadPoolExecutor:
+    """Return the session's thread pool used to run Snowflake calls in the background."""
+    if "_executor" not in st.session_state:
+        st.session_state._executor = ThreadPoolExecutor(max_workers=2)
+    return st.session_state._executor
+
+def submit_background_task(fn: Callable, *args) -> Future:
+    """
+    Run a function on the background thread pool.
+
+    The current script run context is attached to the worker thread so that
+    Streamlit caching and session state keep working inside the task.
+
+    Args:
+        fn (Callable): The function to run.
+        *args: Positional arguments for the function.
+
+    Returns:
+        Future: The future holding the function's result.
+    """
+    ctx = get_script_run_ctx()
+
+    def run():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+
+    return get_executor().submit(run)
+
+def json_dumps(obj, indent: bool = False) -> str:
+    """Serialize an object to a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None).decode()
+    return json.dumps(obj, indent=2 if indent else None)
+
+def json_loads(content: Union[str, bytes]):
+    """Deserialize a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
 def main():
     # Initialize session state
     if "messages" not in st.session_state:
         reset_session_state()
     show_header_and_sidebar()
-    if len(st.session_state.messages) == 0:
-        process_user_input("What questions can I ask?")
     display_conversation()
+    if len(st.session_state.messages) == 0:
+        process_user_input(BOOTSTRAP_QUESTION)
     handle_user_inputs()
     handle_error_notifications()
     display_warnings()
@@ -36,6 +96,12 @@ def reset_session_state():
     st.session_state.active_suggestion = None  # Currently selected suggestion
     st.session_state.warnings = []  # List to store warnings
     st.session_state.form_submitted = {}  # Dictionary to store feedback submission for each request
+    st.session_state.api_responses = {}  # Dictionary to store the API response of each analyst message
+    st.session_state._sql_cache = {}  # Dictionary to store the results of the queries in the conversation
+    st.session_state._chart_cache = OrderedDict()  # Chart series of the query results, see get_chart_series
+    # Forget API responses shown in the previous conversation
+    for key in [key for key in st.session_state if str(key).startswith("api_response_open_")]:
+        del st.session_state[key]
 
 def show_header_and_sidebar():
     """Display the header and sidebar of the app."""
@@ -100,29 +166,36 @@ def process_user_input(prompt: str):
     # Show progress indicator inside analyst chat message while waiting for response
     with st.chat_message("analyst"):
         with st.spinner("Waiting for Analyst's response..."):
-            time.sleep(1)
             response, error_msg = get_analyst_response(st.session_state.messages)
             if error_msg is None:
                 analyst_message = {
                     "role": "analyst",
                     "content": response["message"]["content"],
                     "request_id": response["request_id"],
-                    "api_response": response,  # Added to store full API response
+                }
+                # Store the rest of the API response, the message content is already stored above
+                st.session_state.api_responses[response["request_id"]] = {
+                    k: v for k, v in response.items() if k != "message"
                 }
             else:
                 analyst_message = {
                     "role": "analyst",
                     "content": [{"type": "text", "text": error_msg}],
                     "request_id": response["request_id"],
-                    "api_response": response,  # Added to store full API response
                 }
+                st.session_state.api_responses[response["request_id"]] = response
                 st.session_state["fire_API_error_notify"] = True
 
             if "warnings" in response:
                 st.session_state.warnings = response["warnings"]
 
             st.session_state.messages.append(analyst_message)
-            st.rerun()
+
+        # Render the new message in place instead of rerunning the whole script
+        analyst_msg_index = len(st.session_state.messages) - 1
+        display_message(
+            analyst_message["content"], analyst_msg_index, analyst_message["request_id"]
+        )
 
 def display_warnings():
     """
@@ -132,6 +205,32 @@ def display_warnings():
     for warning in warnings:
         st.warning(warning["message"], icon="⚠️")
 
+def send_api_request(path: str, request_body: Dict) -> Dict:
+    """
+    Send a POST request to a Snowflake REST API endpoint.
+
+    Requests go through the _snowflake proxy of Streamlit in Snowflake, which
+    authenticates with the app's session and manages the underlying connection
+    itself. It returns the complete response body in one piece, so responses
+    cannot be streamed and are handled once they have fully arrived.
+
+    Args:
+        path (str): The API endpoint path.
+        request_body (Dict): The JSON request body.
+
+    Returns:
+        Dict: The response, with the HTTP status under "status" and the serialized body under "content".
+    """
+    return _snowflake.send_snow_api_request(
+        "POST",  # method
+        path,  # path
+        {},  # headers
+        {},  # params
+        request_body,  # body
+        None,  # request_guid
+        API_TIMEOUT,  # timeout in milliseconds
+    )
+
 def get_analyst_response(messages: List[Dict]) -> Tuple[Dict, Optional[str]]:
     """
     Send chat history to the Cortex Analyst API and return the response.
@@ -144,34 +243,77 @@ def get_analyst_response(messages: List[Dict]) -> Tuple[Dict, Optional[str]]:
     """
     # Prepare the request body with the user's prompt, instructions, and model
     request_body = {
-        "messages": messages,
+        "messages": [
+            {"role": message["role"], "content": message["content"]}
+            for message in messages
+        ],
         "semantic_model_file": st.session_state.selected_semantic_model_path
     }
-  
+
+    # The opening question has the same answer for every session on a semantic model
+    if request_body["messages"] == [BOOTSTRAP_MESSAGE]:
+        parsed_content, error_msg = get_bootstrap_response(request_body["semantic_model_file"])
+        if error_msg is not None:
+            # Don't keep errors, so the next attempt asks the API again
+            get_bootstrap_response.clear()
+        return parsed_content, error_msg
+
+    return request_analyst_response(request_body)
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def get_bootstrap_response(semantic_model_path: str) -> Tuple[Dict, Optional[str]]:
+    """
+    Get the Cortex Analyst response to the opening question for a semantic model.
+
+    Args:
+        semantic_model_path (str): The path of the semantic model.
+
+    Returns:
+        Tuple[Dict, Optional[str]]: The response from the Cortex Analyst API and an error message if any.
+    """
+    return request_analyst_response({
+        "messages": [BOOTSTRAP_MESSAGE],
+        "semantic_model_file": semantic_model_path
+    })
+
+def request_analyst_response(request_body: Dict) -> Tuple[Dict, Optional[str]]:
+    """
+    Send a request to the Cortex Analyst API and return the response.
+
+    Args:
+        request_body (Dict): The request body with the messages and semantic model.
+
+    Returns:
+        Tuple[Dict, Optional[str]]: The response from the Cortex Analyst API and an error message if any.
+    """
     # Send a POST request to the Cortex Analyst API endpoint
-    resp = _snowflake.send_snow_api_request(
-        "POST",  # method
-        API_ENDPOINT,  # path
-        {},  # headers
-        {},  # params
-        request_body,  # body
-        None,  # request_guid
-        API_TIMEOUT,  # timeout in milliseconds
-    )
+    resp = send_api_request(API_ENDPOINT, request_body)
 
     # Content is a string with serialized JSON object
-    parsed_content = json.loads(resp["content"])
+    parsed_content = json_loads(resp["content"])
 
     # Check if the response is successful
     if resp["status"] < 400:
         # Return the content of the response as a JSON object
         return parsed_content, None
     else:
-        # Craft readable error message
-        error_msg = f"""
+        return parsed_content, format_api_error(resp["status"], parsed_content)
+
+def format_api_error(status: int, parsed_content: Dict) -> str:
+    """
+    Craft a readable error message from a failed API response.
+
+    Args:
+        status (int): The HTTP status code of the response.
+        parsed_content (Dict): The parsed error response.
+
+    Returns:
+        str: The error message as markdown.
+    """
+    return f"""
 🚨 An Analyst API error has occurred 🚨
 
-* response code: `{resp['status']}`
+* response code: `{status}`
 * request-id: `{parsed_content['request_id']}`
 * error code: `{parsed_content['error_code']}`
 
@@ -180,7 +322,6 @@ Message:
 {parsed_content['message']}
 ```
         """
-        return parsed_content, error_msg
 
 def display_conversation():
     """
@@ -195,6 +336,42 @@ def display_conversation():
             else:
                 display_message(content, idx)
 
+def display_text_content(item: Dict, message_index: int, request_id: Union[str, None]):
+    """Display a text content item."""
+    st.markdown(item["text"])
+
+def display_suggestions_content(item: Dict, message_index: int, request_id: Union[str, None]):
+    """Display a suggestions content item as a single radio widget."""
+    key = f"suggestions_{message_index}"
+    st.radio(
+        "Suggested questions",
+        item["suggestions"],
+        index=None,
+        key=key,
+        label_visibility="collapsed",
+        on_change=select_suggestion,
+        args=(key,),
+    )
+
+def select_suggestion(key: str):
+    """Set the suggestion picked in the given radio widget as the active suggestion."""
+    st.session_state.active_suggestion = st.session_state[key]
+    # Clear the selection, so the same suggestion can be picked again
+    st.session_state[key] = None
+
+def display_sql_content(item: Dict, message_index: int, request_id: Union[str, None]):
+    """Display a SQL content item with the query results."""
+    display_sql_query(
+        item["statement"], message_index, item["confidence"], request_id
+    )
+
+# Renderers for each message content type, other content types are skipped
+CONTENT_RENDERERS: Dict[str, Callable] = {
+    "text": display_text_content,
+    "suggestions": display_suggestions_content,
+    "sql": display_sql_content,
+}
+
 def display_message(
     content: List[Dict[str, Union[str, Dict]]],
     message_index: int,
@@ -209,34 +386,38 @@ def display_message(
         request_id (Union[str, None]): The request ID for analyst messages.
     """
     for item in content:
-        if item["type"] == "text":
-            st.markdown(item["text"])
-        elif item["type"] == "suggestions":
-            # Display suggestions as buttons
-            for suggestion_index, suggestion in enumerate(item["suggestions"]):
-                if st.button(
-                    suggestion, key=f"suggestion_{message_index}_{suggestion_index}"
-                ):
-                    st.session_state.active_suggestion = suggestion
-        elif item["type"] == "sql":
-            # Display the SQL query and results
-            display_sql_query(
-                item["statement"], message_index, item["confidence"], request_id
-            )
-        else:
-            # Handle other content types if necessary
-            pass
+        renderer = CONTENT_RENDERERS.get(item["type"])
+        if renderer is not None:
+            renderer(item, message_index, request_id)
 
     # Add API Response expander for analyst messages
-    if request_id is not None and "api_response" in st.session_state.messages[message_index]:
-        with st.expander("API Response"):
-            st.json(st.session_state.messages[message_index]["api_response"])
+    if request_id is not None:
+        display_api_response(message_index)
+
+@st.fragment
+def display_api_response(message_index: int):
+    """
+    Display the API response of an analyst message once the user asks for it.
+
+    Args:
+        message_index (int): The index of the message.
+    """
+    # Only build and serialize the response when shown, toggling it only reruns this fragment
+    if st.toggle("Show API Response", key=f"api_response_open_{message_index}"):
+        message = st.session_state.messages[message_index]
+        api_response = st.session_state.api_responses[message["request_id"]]
+        if "message" not in api_response:
+            # Rebuild the full API response from the stored message content
+            api_response = {"message": {"role": "analyst", "content": message["content"]}, **api_response}
+        st.code(json_dumps(api_response, indent=True), language="json")
 
-@st.cache_data(show_spinner=False)
 def get_query_exec_result(query: str) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
     """
     Execute the SQL query and convert the results to a pandas DataFrame.
 
+    Results are cached per session, so DataFrames are neither pickled nor
+    shared with other sessions.
+
     Args:
         query (str): The SQL query.
 
@@ -244,11 +425,96 @@ def get_query_exec_result(query: str) -> Tuple[Optional[pd.DataFrame], Optional[
         Tuple[Optional[pd.DataFrame], Optional[str]]: The query results and the error message.
     """
     global session
+    # Reuse the result if the query already ran in this session. Entries are
+    # only dropped when the conversation is reset, since every full rerun
+    # replays all SQL answers of the conversation.
+    cache = st.session_state._sql_cache
+    key = get_query_cache_key(query)
+    if key not in cache:
+        try:
+            cache[key] = session.sql(query).to_pandas(), None
+        except SnowparkSQLException as e:
+            cache[key] = None, str(e)
+    return cache[key]
+
+def get_query_cache_key(query: str) -> bytes:
+    """Return the key of a query result in the session's query cache."""
+    return hashlib.blake2b(query.encode(), digest_size=16).digest()
+
+def dataframe_to_csv(df: pd.DataFrame) -> str:
+    """
+    Convert a DataFrame to a CSV string with PyArrow's C++ writer.
+
+    Falls back to pandas for columns that cannot be converted to Arrow or
+    written as CSV by PyArrow, such as list and struct columns.
+
+    Args:
+        df (pd.DataFrame): The DataFrame to convert.
+
+    Returns:
+        str: The CSV, including a header row and without the index.
+    """
+    buffer = io.BytesIO()
     try:
-        df = session.sql(query).to_pandas()
-        return df, None
-    except SnowparkSQLException as e:
-        return None, str(e)
+        pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buffer)
+    except pa.ArrowException:
+        return df.to_csv(index=False)
+    return buffer.getvalue().decode()
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def get_summary(data_preview_csv: str, model: str = "mistral-large2") -> str:
+    """
+    Summarize a preview of the query results with Cortex Complete.
+
+    The generation is deterministic (temperature 0), so the summary is cached
+    on the preview and model to avoid calling the LLM again on every rerun.
+
+    Args:
+        data_preview_csv (str): The first rows of the query results as CSV.
+        model (str): The Cortex Complete model to use.
+
+    Returns:
+        str: The summary text.
+    """
+    prompt_content = f"""
+    Summarize the following data in detail in order to help user understand their data. 
+    Focus on key insights, trends, or patterns. 
+    Do not include the raw data in the summary.
+    Round up to the nearest 0.1
+    Latency is listed as avg seconds
+
+    Data:
+    {data_preview_csv}
+    """
+    # Create message array for prompt
+    prompt = [{"role": "user", "content": prompt_content}]
+    # Define SQL query for Cortex Complete
+    query = """
+    SELECT SNOWFLAKE.CORTEX.COMPLETE(
+        ?,
+        PARSE_JSON(?),
+        PARSE_JSON(?)
+    ) AS RESPONSE
+    """
+    # Serialize prompt and options to JSON strings
+    prompt_json = json_dumps(prompt)
+    options_json = json_dumps({
+        "temperature": 0,
+        "max_tokens": 500
+    })
+    # Execute query
+    result = session.sql(
+        query,
+        params=[model, prompt_json, options_json]
+    ).to_pandas()
+    # Check if DataFrame is empty or column exists
+    if result.empty or "RESPONSE" not in result.columns:
+        raise ValueError("No summary returned from Cortex Complete")
+    # Parse JSON response to extract the summary text
+    response_json = json_loads(result.iloc[0]["RESPONSE"])
+    if "choices" not in response_json or not response_json["choices"] or "messages" not in response_json["choices"][0]:
+        raise ValueError("Invalid response format from Cortex Complete")
+    return response_json["choices"][0]["messages"]
 
 def display_sql_confidence(confidence: dict):
     if confidence is None:
@@ -273,70 +539,34 @@ def display_sql_confidence(confidence: dict):
             st.text("SQL query:")
             st.code(verified_query_used["sql"], language="sql", wrap_lines=True)
 
+@st.fragment
 def display_sql_query(
     sql: str, message_index: int, confidence: dict, request_id: Union[str, None] = None
 ):
     """
     Executes the SQL query and displays the results in form of data frame and charts.
 
+    Runs as a fragment, so changing the chart selection or feedback of one message
+    only reruns that message instead of replaying the whole conversation.
+
     Args:
         sql (str): The SQL query.
         message_index (int): The index of the message.
         confidence (dict): The confidence information of SQL query generation
         request_id (str): Request id from user request
     """
-    # Execute the SQL query first to get the DataFrame
+    # Execute the SQL query to get the DataFrame
     with st.spinner("Running SQL..."):
         df, err_msg = get_query_exec_result(sql)
 
-    # Generate and display summary if query executed successfully
+    # Generate the summary in the background if query executed successfully,
+    # reserving its place above the SQL query and results
+    summary_placeholder = st.empty()
+    summary_future = None
     if df is not None and not df.empty:
-        try:
-            # Convert DataFrame to string (first 5 rows to avoid token limits)
-            data_preview = df.head(5).to_csv(index=False)
-            prompt_content = f"""
-            Summarize the following data in detail in order to help user understand their data. 
-            Focus on key insights, trends, or patterns. 
-            Do not include the raw data in the summary.
-            Round up to the nearest 0.1
-            Latency is listed as avg seconds
-
-            Data:
-            {data_preview}
-            """
-            # Create message array for prompt
-            prompt = [{"role": "user", "content": prompt_content}]
-            # Define SQL query for Cortex Complete
-            query = """
-            SELECT SNOWFLAKE.CORTEX.COMPLETE(
-                ?,
-                PARSE_JSON(?),
-                PARSE_JSON(?)
-            ) AS RESPONSE
-            """
-            # Serialize prompt and options to JSON strings
-            prompt_json = json.dumps(prompt)
-            options_json = json.dumps({
-                "temperature": 0,
-                "max_tokens": 500
-            })
-            # Execute query
-            result = session.sql(
-                query,
-                params=["mistral-large2", prompt_json, options_json]
-            ).to_pandas()
-            # Check if DataFrame is empty or column exists
-            if result.empty or "RESPONSE" not in result.columns:
-                raise ValueError("No summary returned from Cortex Complete")
-            # Parse JSON response to extract the summary text
-            response_json = json.loads(result.iloc[0]["RESPONSE"])
-            if "choices" not in response_json or not response_json["choices"] or "messages" not in response_json["choices"][0]:
-                raise ValueError("Invalid response format from Cortex Complete")
-            summary = response_json["choices"][0]["messages"]
-            st.markdown("**Summary of Results**")
-            st.markdown(summary)
-        except Exception as e:
-            st.warning(f"Could not generate summary: {str(e)}", icon="⚠️")
+        # Summarize the first rows of the results, in the order of the query
+        data_preview = dataframe_to_csv(df.head(SUMMARY_PREVIEW_ROWS))
+        summary_future = submit_background_task(get_summary, data_preview)
 
        # Display the SQL query
     with st.expander("SQL Query", expanded=False):
@@ -357,6 +587,22 @@ def display_sql_query(
 
             with chart_tab:
                 display_charts_tab(df, message_index)
+
+    # Display the summary once Cortex Complete has returned
+    if summary_future is not None:
+        with summary_placeholder.container():
+            try:
+                with st.spinner("Summarizing results..."):
+                    summary = summary_future.result(timeout=SUMMARY_TIMEOUT)
+                st.markdown("**Summary of Results**")
+                st.markdown(summary)
+            except FutureTimeoutError:
+                st.warning(
+                    f"Could not generate summary: timed out after {SUMMARY_TIMEOUT} seconds",
+                    icon="⚠️",
+                )
+            except Exception as e:
+                st.warning(f"Could not generate summary: {str(e)}", icon="⚠️")
     
     if request_id:
         display_feedback_section(request_id)
@@ -371,14 +617,14 @@ def display_charts_tab(df: pd.DataFrame, message_index: int) -> None:
     """
     # There should be at least 2 columns to draw charts
     if len(df.columns) >= 2:
-        all_cols_set = set(df.columns)
+        all_cols = tuple(df.columns)
         col1, col2 = st.columns(2)
         x_col = col1.selectbox(
-            "X axis", all_cols_set, key=f"x_col_select_{message_index}"
+            "X axis", all_cols, key=f"x_col_select_{message_index}"
         )
         y_col = col2.selectbox(
             "Y axis",
-            all_cols_set.difference({x_col}),
+            [col for col in all_cols if col != x_col],
             key=f"y_col_select_{message_index}",
         )
         chart_type = st.selectbox(
@@ -386,13 +632,41 @@ def display_charts_tab(df: pd.DataFrame, message_index: int) -> None:
             options=["Line Chart 📈", "Bar Chart 📊"],
             key=f"chart_type_{message_index}",
         )
+        chart_data = get_chart_series(df, x_col, y_col)
         if chart_type == "Line Chart 📈":
-            st.line_chart(df.set_index(x_col)[y_col])
+            st.line_chart(chart_data)
         elif chart_type == "Bar Chart 📊":
-            st.bar_chart(df.set_index(x_col)[y_col])
+            st.bar_chart(chart_data)
     else:
         st.write("At least 2 columns are required")
 
+def get_chart_series(df: pd.DataFrame, x_col: str, y_col: str) -> pd.Series:
+    """
+    Get the Y column of the query results indexed by the X column.
+
+    Query results are reused across reruns from the session cache, so the
+    series is cached per session on the DataFrame identity and the selected
+    columns. The DataFrame is kept in the entry, so its id cannot be reused
+    by another DataFrame while the entry exists.
+
+    Args:
+        df (pd.DataFrame): The query results.
+        x_col (str): The column to use as the index.
+        y_col (str): The column to chart.
+
+    Returns:
+        pd.Series: The chart data.
+    """
+    cache = st.session_state._chart_cache
+    key = (id(df), x_col, y_col)
+    entry = cache.pop(key, None)
+    if entry is None or entry[0] is not df:
+        entry = (df, df.set_index(x_col)[y_col])
+    cache[key] = entry
+    if len(cache) > CHART_CACHE_SIZE:
+        cache.popitem(last=False)
+    return entry[1]
+
 def display_feedback_section(request_id: str):
     with st.popover("📝 Query Feedback"):
         if request_id not in st.session_state.form_submitted:
@@ -429,33 +703,13 @@ def submit_feedback(
         "positive": positive,
         "feedback_message": feedback_message,
     }
-    resp = _snowflake.send_snow_api_request(
-        "POST",  # method
-        FEEDBACK_API_ENDPOINT,  # path
-        {},  # headers
-        {},  # params
-        request_body,  # body
-        None,  # request_guid
-        API_TIMEOUT,  # timeout in milliseconds
-    )
+    resp = send_api_request(FEEDBACK_API_ENDPOINT, request_body)
     if resp["status"] == 200:
         return None
 
-    parsed_content = json.loads(resp["content"])
-    # Craft readable error message
-    err_msg = f"""
-        🚨 An Analyst API error has occurred 🚨
-        
-        * response code: `{resp['status']}`
-        * request-id: `{parsed_content['request_id']}`
-        * error code: `{parsed_content['error_code']}`
-        
-        Message:
-        ```
-        {parsed_content['message']}
-        ```
-        """
-    return err_msg
+    # Only parse the content of failed responses
+    parsed_content = json_loads(resp["content"])
+    return format_api_error(resp["status"], parsed_content)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file